@@ -0,0 +1,62 @@
+"""
+    Compares matching vacancy employer names against telecom company names one by one,
+    the way STRPOS queries did it, with the batch CompanyNameMatcher
+"""
+import sys
+from argparse import ArgumentParser
+from os import path
+from random import Random
+from time import time
+from typing import List, Tuple
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "dags"))
+
+
+def generate_names(companies: int, employers: int, matching_ratio: float, seed: int = 42) -> Tuple[List[str], List[str]]:
+    random = Random(seed)
+    company_names = [f'ООО "ТЕЛЕКОМ {index} {random.choice(["СВЯЗЬ", "СЕТИ", "ИНФОРМ", "ТЕЛЕКОМ"])}"' for index in range(companies)]
+    employer_names = []
+    for index in range(employers):
+        if random.random() < matching_ratio:
+            employer_names.append(f"Телеком {random.randrange(companies)}")
+        else:
+            employer_names.append(f"Employer {index} Digital")
+    return company_names, employer_names
+
+
+def match_one_by_one(company_names: List[str], employer_names: List[str]) -> int:
+    lowered = [name.lower() for name in company_names]
+    return sum(1 for name in employer_names if any(name.lower().strip() in company for company in lowered))
+
+
+def match_in_batch(company_names: List[str], employer_names: List[str]) -> int:
+    from vendor.companies.matching.company_name_matcher import CompanyNameMatcher
+    matcher = CompanyNameMatcher(employer_names)
+    matcher.feed(company_names)
+    return sum(1 for name in employer_names if matcher.matches(name))
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="Employer to company name matching")
+    parser.add_argument("--companies", type=int, default=50000, help="telecom companies in the registry")
+    parser.add_argument("--employers", type=int, default=10000, help="vacancies to match")
+    parser.add_argument("--matching-ratio", type=float, default=0.1)
+    parser.add_argument("--sample", type=int, default=200, help="employers matched one by one, the time is extrapolated")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    company_names, employer_names = generate_names(arguments.companies, arguments.employers, arguments.matching_ratio)
+
+    started_at = time()
+    matched = match_in_batch(company_names, employer_names)
+    print(f"     batch: {matched} of {len(employer_names)} matched in {time() - started_at:.2f}s")
+
+    sample = employer_names[:arguments.sample]
+    started_at = time()
+    sample_matched = match_one_by_one(company_names, sample)
+    elapsed = time() - started_at
+    assert sample_matched == match_in_batch(company_names, sample)
+    print(f"one by one: {sample_matched} of {len(sample)} matched in {elapsed:.2f}s, "
+          f"{elapsed * len(employer_names) / len(sample):.2f}s extrapolated to {len(employer_names)} without database round trips")
@@ -0,0 +1,108 @@
+"""
+    Generates a synthetic company registry archive shaped like egrul.json.zip
+"""
+from argparse import ArgumentParser
+from os import close, remove
+from random import Random
+from tempfile import mkstemp
+from typing import Dict, List
+from zipfile import ZIP_DEFLATED, ZipFile
+from orjson import dumps
+
+_OKVED_CODES = ["62.01", "47.11", "41.20", "68.20", "46.90", "70.22", "49.41", "56.10"]
+_TELECOM_OKVED_CODES = ["61.10", "61.20", "61.90", "61.10.1"]
+
+
+def generate_company(random: Random, index: int, telecom_ratio: float) -> Dict[str, any]:
+    telecom = random.random() < telecom_ratio
+    okved_code = random.choice(_TELECOM_OKVED_CODES if telecom else _OKVED_CODES)
+    ogrn = str(1020000000000 + index)
+    name = f'ООО "КОМПАНИЯ {index}"'
+    return {
+        "ogrn": ogrn,
+        "inn": str(7700000000 + index),
+        "kpp": str(770001001 + index % 1000),
+        "name": name,
+        "full_name": f"ОБЩЕСТВО С ОГРАНИЧЕННОЙ ОТВЕТСТВЕННОСТЬЮ {name}",
+        "data": {
+            "ОГРН": ogrn,
+            "СвОКВЭД": {
+                "СвОКВЭДОсн": {
+                    "КодОКВЭД": okved_code,
+                    "НаимОКВЭД": "Деятельность " * random.randint(1, 8)
+                },
+                "СвОКВЭДДоп": [{"КодОКВЭД": random.choice(_OKVED_CODES)} for _ in range(random.randint(0, 6))]
+            },
+            "СвАдресЮЛ": {
+                "АдресРФ": {
+                    "Индекс": str(100000 + index % 900000),
+                    "Регион": {"НаимРегион": "МОСКВА"},
+                    "Улица": {"НаимУлица": "ЛЕНИНА " * random.randint(1, 4)}
+                }
+            }
+        }
+    }
+
+
+def _write_member(archive: ZipFile, name: str, random: Random, first_index: int, size_in_bytes: int, telecom_ratio: float) -> int:
+    index = first_index
+    written = 0
+    with archive.open(name, "w", force_zip64=True) as member:
+        member.write(b"[")
+        while written < size_in_bytes:
+            payload = dumps(generate_company(random, index, telecom_ratio))
+            if index > first_index:
+                payload = b"," + payload
+            member.write(payload)
+            written += len(payload)
+            index += 1
+        member.write(b"]")
+    return index - first_index
+
+
+def generate_archive(output_filename: str, size_in_mb: int, members: int = 4, nesting: int = 0,
+                     telecom_ratio: float = 0.05, seed: int = 42) -> int:
+    """
+        Writes the archive and returns the total amount of generated records.
+        Every nesting level wraps the members into an additional zip archive
+    """
+    random = Random(seed)
+    member_size = max(1, size_in_mb * 1024 * 1024 // max(1, members))
+    total = 0
+
+    def _fill(archive: ZipFile, level: int, prefix: str):
+        nonlocal total
+        if level < nesting:
+            descriptor, nested_filename = mkstemp(suffix=".zip")
+            close(descriptor)
+            try:
+                with ZipFile(nested_filename, "w", ZIP_DEFLATED, allowZip64=True) as nested_archive:
+                    _fill(nested_archive, level + 1, f"{prefix}nested-{level}-")
+                archive.write(nested_filename, f"{prefix}nested-{level}.zip")
+            finally:
+                remove(nested_filename)
+        else:
+            for member in range(members):
+                total += _write_member(archive, f"{prefix}part-{member}.json", random, total, member_size, telecom_ratio)
+
+    with ZipFile(output_filename, "w", ZIP_DEFLATED, allowZip64=True) as archive:
+        _fill(archive, 0, "")
+    return total
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="Generates a synthetic egrul registry archive")
+    parser.add_argument("output", help="output zip filename")
+    parser.add_argument("--size-mb", type=int, default=256, help="total decompressed size of json members")
+    parser.add_argument("--members", type=int, default=4, help="amount of json members")
+    parser.add_argument("--nesting", type=int, default=0, help="how many times members are wrapped into nested zip archives")
+    parser.add_argument("--telecom-ratio", type=float, default=0.05, help="share of companies with the 61.* okved code")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    total = generate_archive(arguments.output, arguments.size_mb, arguments.members,
+                             arguments.nesting, arguments.telecom_ratio, arguments.seed)
+    print(f"Generated {total} records into {arguments.output}")
@@ -0,0 +1,108 @@
+"""
+    Measures the crawler throughput against the local hh api stub which runs in its own process.
+    Requests served by the stub are counted, so repeated runs show how many of them the response cache saves
+"""
+import asyncio
+import sys
+from aiohttp import ClientSession
+from argparse import ArgumentParser
+from multiprocessing import Process, Queue
+from os import path
+from time import time
+from typing import Dict, List
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "dags"))
+
+from hh_stub_server import HHStubServer
+
+
+def _serve(arguments, endpoints: Queue):
+    async def _run():
+        server = HHStubServer(arguments.vacancies, arguments.employers, arguments.latency,
+                              arguments.untrusted_ratio, arguments.throttled_ratio)
+        endpoints.put(await server.start())
+        await asyncio.Event().wait()
+    asyncio.run(_run())
+
+
+async def _crawl(endpoint: str, limit: int, arguments) -> Dict[str, any]:
+    from vendor.config.configuration import Configuration
+    from vendor.hhcrawler.provider import hh_dataprovider
+
+    hh_dataprovider.use_configuration(Configuration({
+        "hh-api-endpoint": f"{endpoint}/vacancies",
+        "request-timeout-in-seconds": 15,
+        "max-concurrent-requests": arguments.max_concurrent_requests,
+        "rate-limit": {
+            "requests-per-second": arguments.requests_per_second,
+            "burst": arguments.burst
+        },
+        "retry": {
+            "max-attempts": 5,
+            "base-delay-in-seconds": 0.05
+        },
+        "response-cache": {
+            "enabled": bool(arguments.response_cache),
+            "directory": arguments.response_cache,
+            "ttl-in-seconds": arguments.cache_ttl
+        }
+    }))
+    requests_before = await _stub_requests(endpoint)
+    started_at = time()
+    vacancies = 0
+    with_industries = 0
+    async for vacancy in hh_dataprovider.each_vacancy("python", limit, arguments.prefetch):
+        vacancies += 1
+        with_industries += 1 if vacancy.industries else 0
+    elapsed = time() - started_at
+    requests_after = await _stub_requests(endpoint)
+    return {
+        "limit": limit,
+        "vacancies": vacancies,
+        "with_industries": with_industries,
+        "seconds": elapsed,
+        "vacancies_per_second": vacancies / elapsed if elapsed else 0,
+        "requests": {kind: requests_after[kind] - requests_before.get(kind, 0) for kind in requests_after}
+    }
+
+
+async def _stub_requests(endpoint: str) -> Dict[str, int]:
+    async with ClientSession() as session:
+        async with session.get(f"{endpoint}/stats") as response:
+            return await response.json()
+
+
+def benchmark(endpoint: str, limits: List[int], arguments) -> List[Dict[str, any]]:
+    return [asyncio.run(_crawl(endpoint, limit, arguments)) for limit in limits for _ in range(arguments.runs)]
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="HH crawler throughput against a local api stub")
+    parser.add_argument("--limits", type=int, nargs="+", default=[250, 10000], help="same as vacancy-limit")
+    parser.add_argument("--prefetch", type=int, default=50, help="same as vacancy-prefetch")
+    parser.add_argument("--max-concurrent-requests", type=int, default=16)
+    parser.add_argument("--requests-per-second", type=float, default=0, help="per host, 0 disables rate limiting")
+    parser.add_argument("--burst", type=int, default=16)
+    parser.add_argument("--vacancies", type=int, default=12000)
+    parser.add_argument("--employers", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds every stub response is delayed by")
+    parser.add_argument("--untrusted-ratio", type=float, default=0.05)
+    parser.add_argument("--throttled-ratio", type=float, default=0.0)
+    parser.add_argument("--response-cache", help="directory of the response cache, disabled if not given")
+    parser.add_argument("--cache-ttl", type=float, default=86400, help="seconds, cached responses older than that are revalidated")
+    parser.add_argument("--runs", type=int, default=1, help="runs of every limit")
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    endpoints = Queue()
+    server = Process(target=_serve, args=(arguments, endpoints), daemon=True)
+    server.start()
+    try:
+        endpoint = endpoints.get()
+        for report in benchmark(endpoint, arguments.limits, arguments):
+            print("limit {limit:>6}: {vacancies} vacancies ({with_industries} with industries) in {seconds:.2f}s, "
+                  "{vacancies_per_second:.0f} vacancies/s, stub requests {requests}".format(**report))
+    finally:
+        server.terminate()
@@ -0,0 +1,133 @@
+"""
+    A local stand-in of the hh.ru vacancies api. It serves search pages, vacancy and employer
+    details with the configured latency, a share of untrusted employers and of throttled responses.
+    Details are served with ETag and answered with 304 when the client already has them
+"""
+import asyncio
+from argparse import ArgumentParser
+from hashlib import sha1
+from json import dumps
+from random import Random
+from typing import Dict, List
+
+from aiohttp import web
+
+
+class HHStubServer:
+
+    def __init__(self, vacancies: int = 10000, employers: int = 500, latency_in_seconds: float = 0.02,
+                 untrusted_ratio: float = 0.05, throttled_ratio: float = 0.0, seed: int = 42) -> None:
+        self._vacancies = vacancies
+        self._employers = employers
+        self._latency = latency_in_seconds
+        self._untrusted_ratio = untrusted_ratio
+        self._throttled_ratio = throttled_ratio
+        self._random = Random(seed)
+        self._runner = None
+        self.requests: Dict[str, int] = {"search": 0, "vacancy": 0, "employer": 0, "not-modified": 0, "throttled": 0}
+        self.endpoint = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        application = web.Application()
+        application.router.add_get("/vacancies", self._search)
+        application.router.add_get("/vacancies/{id}", self._vacancy)
+        application.router.add_get("/employers/{id}", self._employer)
+        application.router.add_get("/stats", self._stats)
+        self._runner = web.AppRunner(application, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.endpoint = f"http://{host}:{port}"
+        return self.endpoint
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def _respond(self, request: web.Request, kind: str, payload: Dict[str, any]) -> web.Response:
+        await asyncio.sleep(self._latency)
+        if self._throttled_ratio and self._random.random() < self._throttled_ratio:
+            self.requests["throttled"] += 1
+            return web.json_response({"errors": [{"type": "too_many_requests"}]}, status=429, headers={"Retry-After": "0"})
+        body = dumps(payload)
+        headers = {}
+        if kind != "search":
+            headers["ETag"] = f'"{sha1(body.encode()).hexdigest()[:16]}"'
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                self.requests["not-modified"] += 1
+                return web.Response(status=304, headers=headers)
+        self.requests[kind] += 1
+        return web.Response(text=body, content_type="application/json", headers=headers)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.requests)
+
+    def _employer_id(self, vacancy_id: int) -> int:
+        return vacancy_id % self._employers
+
+    async def _search(self, request: web.Request) -> web.Response:
+        per_page = int(request.query.get("per_page", 20))
+        page = int(request.query.get("page", 0))
+        first = page * per_page
+        items: List[Dict[str, any]] = []
+        for vacancy_id in range(first, min(first + per_page, self._vacancies)):
+            employer_id = self._employer_id(vacancy_id)
+            items.append({
+                "id": str(vacancy_id),
+                "url": f"{self.endpoint}/vacancies/{vacancy_id}",
+                "name": f"Python developer {vacancy_id}",
+                "employer": {
+                    "id": str(employer_id),
+                    "name": f"Employer {employer_id}",
+                    "trusted": (vacancy_id * 7919 % 1000) / 1000 >= self._untrusted_ratio
+                }
+            })
+        return await self._respond(request, "search", {
+            "found": self._vacancies,
+            "pages": -(-self._vacancies // per_page),
+            "page": page,
+            "per_page": per_page,
+            "items": items
+        })
+
+    async def _vacancy(self, request: web.Request) -> web.Response:
+        vacancy_id = int(request.match_info["id"])
+        employer_id = self._employer_id(vacancy_id)
+        return await self._respond(request, "vacancy", {
+            "id": str(vacancy_id),
+            "description": "<p>Python, PostgreSQL, asyncio</p>" * 20,
+            "key_skills": [{"name": "Python"}, {"name": "PostgreSQL"}, {"name": f"Skill {vacancy_id % 50}"}],
+            "salary": {"from": 100000 + vacancy_id, "to": 200000 + vacancy_id, "currency": "RUR"},
+            "employer": {"id": str(employer_id), "url": f"{self.endpoint}/employers/{employer_id}"}
+        })
+
+    async def _employer(self, request: web.Request) -> web.Response:
+        employer_id = int(request.match_info["id"])
+        industries = [{"id": "9.399", "name": "Telecom"}] if employer_id % 10 == 0 else [{"id": "7.540", "name": "IT"}]
+        return await self._respond(request, "employer", {
+            "id": str(employer_id),
+            "site_url": f"https://employer-{employer_id}.example",
+            "industries": industries
+        })
+
+
+async def _serve(arguments):
+    server = HHStubServer(arguments.vacancies, arguments.employers, arguments.latency, arguments.untrusted_ratio, arguments.throttled_ratio)
+    endpoint = await server.start(arguments.host, arguments.port)
+    print(f"Serving hh api stub at {endpoint}/vacancies")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Local stand-in of the hh.ru vacancies api")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--vacancies", type=int, default=10000)
+    parser.add_argument("--employers", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds every response is delayed by")
+    parser.add_argument("--untrusted-ratio", type=float, default=0.05)
+    parser.add_argument("--throttled-ratio", type=float, default=0.0)
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,175 @@
+"""
+    Runs the company registry and the vacancies pipelines end to end without network:
+    the registry is a synthetic archive, hh api is the local stub and the target is a throwaway
+    SQLite database unless a connection url is given. Every pipeline runs in its own process,
+    records/s, peak rss and p50/p99 latencies of the stages are reported
+"""
+import sys
+from argparse import ArgumentParser
+from json import dump
+from multiprocessing import Process, Queue
+from os import makedirs, path
+from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+from typing import Dict, List
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "dags"))
+
+from egrul_generator import generate_archive
+from hh_crawler import _serve
+
+
+def _peak_rss_mb() -> float:
+    return max(getrusage(RUSAGE_SELF).ru_maxrss, getrusage(RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+
+def _run_companies(arguments, work_dir: str, results: Queue):
+    from vendor.config.configuration import Configuration
+    from vendor.companies.producer import execute_company_registry
+    from vendor.metrics import metrics
+
+    sqlite = not arguments.companies_url
+    started_at = time()
+    reports = execute_company_registry(Configuration({"processes": {"egrul-registry": {
+        "datasource": {
+            "data-path": path.join(work_dir, "registry"),
+            "streaming": {"enabled": True, "slice-size": arguments.slice_size}
+        },
+        "datastore": {
+            "connection-url": arguments.companies_url or f"sqlite:///{path.join(work_dir, 'companies.db')}",
+            "driver": "PostgreDatastore",
+            "parameters": {
+                "batch": {"max-size": arguments.batch_size, "mode": "orm" if sqlite else "copy", "upsert": not sqlite},
+                "max-pool-size": 1 if sqlite else 4,
+                "connect-args": {"check_same_thread": False} if sqlite else {}
+            }
+        },
+        "processor": {
+            "scheduler": arguments.scheduler,
+            "max-processes": arguments.workers,
+            "max-io-workers": arguments.workers,
+            "transformer": {"transformer": "ProjectionTransformer", "parameters": {"model": "Company"}}
+        }
+    }}}))
+    elapsed = time() - started_at
+    records = sum(report.records for report in reports)
+    results.put({
+        "pipeline": "companies",
+        "records": records,
+        "models": sum(report.models for report in reports),
+        "seconds": elapsed,
+        "records_per_second": records / elapsed if elapsed else 0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "metrics": metrics.snapshot()
+    })
+
+
+def _run_vacancies(arguments, work_dir: str, endpoint: str, results: Queue):
+    from vendor.config.configuration import Configuration
+    from vendor.hhcrawler.crawler import crawler_runner
+    from vendor.metrics import metrics
+
+    started_at = time()
+    crawler_runner(Configuration({
+        "datastore": {
+            "connection-string": arguments.vacancies_url or f"sqlite:///{path.join(work_dir, 'vacancies.db')}",
+            "batch-size": 100,
+            "queue-size": 500
+        },
+        "hh-api-endpoint": f"{endpoint}/vacancies",
+        "vacancy-limit": arguments.vacancy_limit,
+        "vacancy-prefetch": 50,
+        "max-concurrent-requests": arguments.max_concurrent_requests
+    }))
+    elapsed = time() - started_at
+    records = metrics.counter("datastore.models").value()
+    results.put({
+        "pipeline": "vacancies",
+        "records": records,
+        "models": records,
+        "seconds": elapsed,
+        "records_per_second": records / elapsed if elapsed else 0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "metrics": metrics.snapshot()
+    })
+
+
+def _run_in_process(target, *args) -> Dict[str, any]:
+    results = Queue()
+    process = Process(target=target, args=(*args, results))
+    process.start()
+    report = results.get()
+    process.join()
+    return report
+
+
+def benchmark(arguments, work_dir: str) -> List[Dict[str, any]]:
+    reports = []
+    if "companies" in arguments.pipelines:
+        makedirs(path.join(work_dir, "registry"))
+        records = generate_archive(path.join(work_dir, "registry", "egrul.json.zip"), arguments.size_mb,
+                                   arguments.members, arguments.nesting, arguments.telecom_ratio)
+        print(f"Generated {records} records ({arguments.size_mb} MB in {arguments.members} members)")
+        reports.append(_run_in_process(_run_companies, arguments, work_dir))
+
+    if "vacancies" in arguments.pipelines:
+        endpoints = Queue()
+        server = Process(target=_serve, args=(arguments, endpoints), daemon=True)
+        server.start()
+        try:
+            reports.append(_run_in_process(_run_vacancies, arguments, work_dir, endpoints.get()))
+        finally:
+            server.terminate()
+    return reports
+
+
+def _print_report(report: Dict[str, any]):
+    print("{pipeline:>10}: {records} records, {models} models in {seconds:.2f}s, "
+          "{records_per_second:.0f} records/s, peak rss {peak_rss_mb:.0f} MB".format(**report))
+    for name, timer in report["metrics"]["timers"].items():
+        print(f"{'':>12}{name:<30} count {timer['count']:>8}  p50 {timer['p50_seconds'] * 1000:>9.2f}ms  "
+              f"p99 {timer['p99_seconds'] * 1000:>9.2f}ms  total {timer['total_seconds']:>8.2f}s")
+    for name, value in report["metrics"]["counters"].items():
+        print(f"{'':>12}{name:<30} {value}")
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="Offline end to end benchmark of the companies and the vacancies pipelines")
+    parser.add_argument("--pipelines", nargs="+", choices=["companies", "vacancies"], default=["companies", "vacancies"])
+    parser.add_argument("--output", help="json file the reports are written to")
+    registry = parser.add_argument_group("companies")
+    registry.add_argument("--size-mb", type=int, default=256, help="total decompressed size of the synthetic archive")
+    registry.add_argument("--members", type=int, default=4)
+    registry.add_argument("--nesting", type=int, default=0)
+    registry.add_argument("--telecom-ratio", type=float, default=0.05, help="share of companies with telecom okved codes")
+    registry.add_argument("--scheduler", choices=["threads", "processes"], default="threads")
+    registry.add_argument("--workers", type=int, default=2)
+    registry.add_argument("--slice-size", type=int, default=1000)
+    registry.add_argument("--batch-size", type=int, default=5000)
+    registry.add_argument("--companies-url", help="postgresql connection url, a throwaway sqlite database by default")
+    crawler = parser.add_argument_group("vacancies")
+    crawler.add_argument("--vacancy-limit", type=int, default=2000)
+    crawler.add_argument("--max-concurrent-requests", type=int, default=16)
+    crawler.add_argument("--vacancies-url", help="postgresql connection url, a throwaway sqlite database by default")
+    crawler.add_argument("--vacancies", type=int, default=12000, help="vacancies served by the stub")
+    crawler.add_argument("--employers", type=int, default=500)
+    crawler.add_argument("--latency", type=float, default=0.02, help="seconds every stub response is delayed by")
+    crawler.add_argument("--untrusted-ratio", type=float, default=0.05)
+    crawler.add_argument("--throttled-ratio", type=float, default=0.0)
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    work_dir = mkdtemp(prefix="pipelines-benchmark-")
+    try:
+        reports = benchmark(arguments, work_dir)
+        for report in reports:
+            _print_report(report)
+        if arguments.output:
+            with open(arguments.output, "w") as output:
+                dump(reports, output, indent=2)
+    finally:
+        rmtree(work_dir)
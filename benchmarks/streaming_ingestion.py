@@ -0,0 +1,87 @@
+"""
+    Compares peak memory usage and throughput of the eager and the streaming
+    registry ingestion on a synthetic archive. Every mode runs in its own process
+"""
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Process, Queue
+from os import path
+from resource import RUSAGE_SELF, getrusage
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+from typing import Dict, List
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "dags"))
+
+from egrul_generator import generate_archive
+
+
+def _consume(datasource) -> int:
+    total = 0
+    datasource.load()
+    for slice in datasource.slices():
+        total += len(slice)
+    datasource.release()
+    return total
+
+
+def _run(data_path: str, streaming: bool, workers: int, slice_size: int, results: Queue):
+    from vendor.config.configuration import Configuration
+    from vendor.companies.providers.file_data_provider import FileDataProvider
+
+    provider = FileDataProvider(Configuration({
+        "data-path": data_path,
+        "streaming": {
+            "enabled": streaming,
+            "slice-size": slice_size
+        }
+    }))
+    started_at = time()
+    provider.initialize()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(_consume, provider.datasources()))
+    elapsed = time() - started_at
+    provider.cleanup()
+    results.put({
+        "mode": "streaming" if streaming else "eager",
+        "records": total,
+        "seconds": elapsed,
+        "records_per_second": total / elapsed if elapsed else 0,
+        "peak_rss_mb": getrusage(RUSAGE_SELF).ru_maxrss / 1024
+    })
+
+
+def compare(data_path: str, workers: int, slice_size: int) -> List[Dict[str, any]]:
+    reports = []
+    for streaming in (False, True):
+        results = Queue()
+        process = Process(target=_run, args=(data_path, streaming, workers, slice_size, results))
+        process.start()
+        reports.append(results.get())
+        process.join()
+    return reports
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="Eager vs streaming registry ingestion")
+    parser.add_argument("--size-mb", type=int, default=2048, help="total decompressed size of the synthetic archive")
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--nesting", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=2, help="same as processor.max-io-workers")
+    parser.add_argument("--slice-size", type=int, default=1000)
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    data_path = mkdtemp(prefix="egrul-benchmark-")
+    archive_filename = path.join(data_path, "egrul.json.zip")
+    try:
+        records = generate_archive(archive_filename, arguments.size_mb, arguments.members, arguments.nesting)
+        print(f"Generated {records} records ({arguments.size_mb} MB in {arguments.members} members)")
+        for report in compare(data_path, arguments.workers, arguments.slice_size):
+            print("{mode:>10}: {records} records in {seconds:.2f}s, {records_per_second:.0f} records/s, peak rss {peak_rss_mb:.0f} MB".format(**report))
+    finally:
+        rmtree(data_path)
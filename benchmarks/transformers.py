@@ -0,0 +1,49 @@
+"""
+    Measures records/sec of the transformers on synthetic registry records
+"""
+import sys
+from argparse import ArgumentParser
+from os import path
+from random import Random
+from time import time
+from typing import Dict, List
+
+sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "dags"))
+
+from egrul_generator import generate_company
+
+
+def measure(transformer_name: str, records: List[Dict[str, any]], model: str = "Company") -> Dict[str, any]:
+    from vendor.config.configuration import Configuration
+    from vendor.companies.reflection.dymanic_import_utils import import_class
+
+    transformer = import_class("vendor.companies.transformers", transformer_name)(Configuration({"model": model}))
+    accepted = 0
+    started_at = time()
+    for record in records:
+        if transformer.process(record):
+            accepted += 1
+    elapsed = time() - started_at
+    return {
+        "transformer": transformer_name,
+        "records": len(records),
+        "accepted": accepted,
+        "seconds": elapsed,
+        "records_per_second": len(records) / elapsed if elapsed else 0
+    }
+
+
+def _parse_args(args: List[str] = None):
+    parser = ArgumentParser(description="GenericTransformer vs ProjectionTransformer")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--telecom-ratio", type=float, default=0.05)
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    arguments = _parse_args()
+    random = Random(42)
+    records = [generate_company(random, index, arguments.telecom_ratio) for index in range(arguments.records)]
+    for transformer_name in ("GenericTransformer", "ProjectionTransformer"):
+        report = measure(transformer_name, records)
+        print("{transformer:>22}: {records} records, {accepted} accepted in {seconds:.2f}s, {records_per_second:.0f} records/s".format(**report))
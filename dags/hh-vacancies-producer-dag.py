@@ -31,11 +31,37 @@ class HttpxFileDownloader(BaseOperator):
         from vendor.config.provider import ConfigurationProvider
         from vendor.downloader.downloader import download
         configuration = ConfigurationProvider().load(self.config_filename)
-        download(configuration.property("url"), configuration.property("output-filename"))
+        if not download(configuration.property("url"), configuration.property("output-filename")):
+            self.log.info("Company registry is not changed since the last download")
 
 def process_batch(executor):
         executor.execute()
 
+def dump_metrics(context: Context):
+    """
+        Metrics of the task are logged and written as json to {metrics_output_dir}/{dag_id}/{run_id}/{task_id}.json
+    """
+    import os
+    from vendor.metrics import metrics
+    task_instance = context["ti"]
+    report = metrics.dump()
+    metrics.reset()
+    task_instance.log.info("Task metrics %s", report)
+    output_dir = os.path.join(Variable.get("metrics_output_dir", default_var="/opt/airflow/logs/metrics"),
+                              task_instance.dag_id, task_instance.run_id)
+    map_index = f"-{task_instance.map_index}" if task_instance.map_index >= 0 else ""
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, f"{task_instance.task_id}{map_index}.json"), "w") as output:
+            output.write(report)
+    except OSError as ex:
+        task_instance.log.warning("Could not write task metrics cause %s", ex)
+
+default_args = {
+    "on_success_callback": dump_metrics,
+    "on_failure_callback": dump_metrics
+}
+
 vacancies_dataset = Dataset("postgresql://vacancies")
 companies_dataset = Dataset("postgresql://companies")
 start_date = pendulum.now('UTC')
@@ -44,6 +70,7 @@ start_date = pendulum.now('UTC')
     schedule="0 */6 * * *",
     start_date=start_date,
     catchup=False,
+    default_args=default_args,
     tags=["hw", "producer", "vacancies"],
     max_active_runs=1
 )
@@ -54,6 +81,7 @@ def discover_hh_relevant_vacancies():
     schedule="@monthly",
     start_date=start_date,
     catchup=False,
+    default_args=default_args,
     tags=["hw", "producer", "companies"],
     max_active_runs=1
 )
@@ -79,6 +107,7 @@ def discover_relevant_companies():
     schedule=[vacancies_dataset],
     start_date=start_date,
     catchup=False,
+    default_args=default_args,
     tags=["hw", "consumer", "rating"],
 )
 def search_top_skills():
@@ -93,11 +122,12 @@ def search_top_skills():
                     COUNT(V.ID) AS TOTAL
                 FROM
                     VACANCY V
+                INNER JOIN VACANCY_INDUSTRY VI ON
+                    VI.VACANCY_ID = V.ID
                 INNER JOIN SKILL S ON
                     S.VACANCY_ID = V.ID
                 WHERE
-                    '9' = ANY (STRING_TO_ARRAY(V.INDUSTRIES,
-                    ',')) -- 9 means telecom
+                    VI.INDUSTRY = '9' -- 9 means telecom
                 GROUP BY
                     S.NAME
                 ORDER BY
@@ -126,20 +156,20 @@ def search_top_skills():
             """)
             records = vacancies_cursor.fetchall()
             if records:
+                from vendor.companies.matching.company_name_matcher import CompanyNameMatcher
+                # employer names are matched against all of the company names in a single scan of the registry
+                matcher = CompanyNameMatcher(name for _, name in records)
                 companies_store = PostgresHook(postgres_conn_id='companies_store')
-                relevant_vacancy_ids = []
-                with companies_store.get_conn().cursor() as companies_cursor: 
-                    for r in records:
-                        id, name = r
-                        if name:
-                            companies_cursor.execute("""
-                                SELECT COUNT(ID) > 0 FROM COMPANY C 
-                                WHERE STRPOS(LOWER(C.NAME), %s) > 0
-                            """, (name.lower().strip(),))
-                            exists, = companies_cursor.fetchone()
-                            if exists:
-                                relevant_vacancy_ids.append(id)
-
+                with companies_store.get_conn() as companies_connection:
+                    with companies_connection.cursor(name="company_names") as companies_cursor:
+                        companies_cursor.itersize = 10000
+                        companies_cursor.execute("""
+                            SELECT C.NAME FROM COMPANY C
+                        """)
+                        matcher.feed(name for name, in companies_cursor)
+                relevant_vacancy_ids = [id for id, name in records if matcher.matches(name)]
+                if not relevant_vacancy_ids:
+                    return result_set
 
                 vacancies_cursor.execute("""
                     SELECT